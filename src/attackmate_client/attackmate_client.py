@@ -1,10 +1,22 @@
+import asyncio
+import atexit
+import base64
+import binascii
+import functools
+import gzip
 import json
 import logging
 import os
+import stat
 import threading
-from typing import Any, Dict, Optional, Tuple
+import time
+import zlib
+from types import MappingProxyType
+from typing import IO, Any, Dict, Iterator, Mapping, Optional, Tuple, Union
 from pydantic import BaseModel
 import httpx
+import orjson
+from cachetools import LRUCache, TLRUCache
 from pydantic import SecretStr
 
 logger = logging.getLogger('playbook')
@@ -15,10 +27,202 @@ class ExecException(Exception):
     """
 
 
-# Global cache for active sessions (token storage), keyed by (server_url, username)
-_active_sessions: Dict[Tuple[str, str], str] = {}
+# Upper bound on cached sessions; the least recently used session is evicted first
+MAX_SESSIONS = 256
+# Sessions whose token expiry is unknown are dropped (and logged in again) after this many seconds
+SESSION_MAX_TTL = 3600.0
+
+
+def _session_ttu(key: Tuple[str, str], session: Dict[str, Any], now: float) -> float:
+    """Time-to-use for a cached session: its token expiry, or SESSION_MAX_TTL if unknown."""
+    expires_at = session.get('expires_at')
+    return expires_at if expires_at is not None else now + SESSION_MAX_TTL
+
+
+# Global cache for active sessions, keyed by (server_url, username). Each session holds the
+# 'token', its 'expires_at' timestamp (None if the server did not reveal an expiry) and the
+# read-only auth 'headers' built for it, so no header mapping outlives its session.
+# Expired sessions are evicted automatically; access is guarded by _sessions_lock.
+_active_sessions: TLRUCache[Tuple[str, str], Dict[str, Any]] = TLRUCache(
+    maxsize=MAX_SESSIONS, ttu=_session_ttu, timer=time.time)
 _sessions_lock = threading.Lock()
+# One lock per (server_url, username): the first thread without a token logs in while the
+# others wait on the lock and then pick up the stored token instead of logging in themselves.
+# Bounded like the session cache; a lock that is in use is recently used and thus not evicted.
+# Access is guarded by _sessions_lock.
+_login_locks: LRUCache[Tuple[str, str], threading.Lock] = LRUCache(maxsize=MAX_SESSIONS)
 DEFAULT_TIMEOUT = 60.0
+# Login is quick, so it fails fast on network issues; executions use the configurable timeout
+LOGIN_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+# Request body for YAML uploads: the content itself, or a binary file object that is streamed
+ContentData = Union[str, bytes, IO[bytes]]
+# Uploads smaller than this are sent uncompressed even when compression is enabled
+COMPRESS_MIN_SIZE = 4096
+# Chunk size for reading response bodies
+RESPONSE_CHUNK_SIZE = 65536
+# Chunk size for reading streamed request bodies
+UPLOAD_CHUNK_SIZE = 65536
+# Shared, read-only query parameters for debug executions
+_DEBUG_PARAMS: Mapping[str, str] = MappingProxyType({'debug': 'true'})
+# Tokens are refreshed this many seconds before they expire, to avoid a wasted 401 round-trip
+TOKEN_EXPIRY_SKEW = 30.0
+
+
+def _token_expiry(token: str, login_data: Dict[str, Any]) -> Optional[float]:
+    """Determines when a token expires, from 'expires_in' or the JWT 'exp' claim."""
+    expires_in = login_data.get('expires_in')
+    if isinstance(expires_in, (int, float)):
+        return time.time() + expires_in
+
+    # Not verifying the signature: the claim is only used to schedule a refresh
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    except (IndexError, ValueError, binascii.Error):
+        return None
+    exp = claims.get('exp') if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def _parse_json(response: httpx.Response) -> Any:
+    """Parses a JSON response body with orjson (much faster than response.json())."""
+    return orjson.loads(response.content)
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_verify(cacert: str) -> Any:
+    """Returns the CA file path if it exists, otherwise True (system CAs). Cached per path."""
+    return cacert if os.path.exists(cacert) else True
+
+
+def _iter_stream(stream: IO[bytes]) -> Iterator[bytes]:
+    """Reads a binary stream chunk by chunk, from its current position to the end."""
+    return iter(functools.partial(stream.read, UPLOAD_CHUNK_SIZE), b'')
+
+
+def _iter_gzip(stream: IO[bytes]) -> Iterator[bytes]:
+    """Gzip-compresses a binary stream chunk by chunk, without reading it into memory."""
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    for chunk in _iter_stream(stream):
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def _remaining_file_size(stream: IO[bytes]) -> Optional[int]:
+    """Bytes left to read from a stream backed by a regular file, or None if unknown."""
+    try:
+        file_stat = os.fstat(stream.fileno())
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None  # pipes, sockets and ttys report no meaningful size
+        return file_stat.st_size - stream.tell()
+    except (AttributeError, OSError, ValueError):  # e.g. in-memory buffers without a file descriptor
+        return None
+
+
+def _gzip_content(content_data: Union[str, bytes]) -> Optional[bytes]:
+    """Returns the gzip-compressed body, or None if it is too small to be worth compressing."""
+    raw = content_data.encode() if isinstance(content_data, str) else content_data
+    if len(raw) <= COMPRESS_MIN_SIZE:
+        return None
+    return gzip.compress(raw, compresslevel=1)
+
+
+def _stream_body(stream: IO[bytes], compress: bool) -> Tuple[Dict[str, str], Iterator[bytes]]:
+    """Returns the extra headers and the chunked body for uploading a binary stream.
+
+    httpx would take Content-Length from fstat(), which is 0 for pipes and ignores the stream
+    position, so the body is always read in chunks. Uncompressed regular files declare their
+    remaining size; compressed bodies and streams of unknown size (pipes, in-memory buffers)
+    use chunked transfer encoding. Streams of unknown size are always compressed.
+    """
+    size = _remaining_file_size(stream)
+    if compress and (size is None or size > COMPRESS_MIN_SIZE):
+        return {'Content-Encoding': 'gzip'}, _iter_gzip(stream)
+    if size is None:
+        return {}, _iter_stream(stream)
+    return {'Content-Length': str(size)}, _iter_stream(stream)
+
+
+def _auth_headers(token: str) -> Mapping[str, str]:
+    """Returns a read-only auth header mapping for the token."""
+    return MappingProxyType({'X-Auth-Token': token})
+
+
+def _is_session_valid(session: Dict[str, Any]) -> bool:
+    """Returns False if the session's token expires within TOKEN_EXPIRY_SKEW seconds."""
+    expires_at = session.get('expires_at')
+    return expires_at is None or time.time() < expires_at - TOKEN_EXPIRY_SKEW
+
+
+# Shared HTTP clients, keyed by (server_url, verify, read timeout, connect timeout), so that
+# instances with the same connection settings (e.g. different users on one server) share one
+# connection pool. httpx.Client is safe to use from multiple threads; only the pool bookkeeping
+# below needs a lock. Reference counts let close() release a client once no instance uses it.
+_ClientKey = Tuple[str, str, Optional[float], Optional[float]]
+_client_pool: Dict[_ClientKey, httpx.Client] = {}
+_client_refs: Dict[_ClientKey, int] = {}
+_client_pool_lock = threading.Lock()
+
+
+def _client_key(server_url: str, verify_ssl: Any, timeout_config: httpx.Timeout) -> _ClientKey:
+    return (server_url, repr(verify_ssl), timeout_config.read, timeout_config.connect)
+
+
+def _build_client(server_url: str, verify_ssl: Any, timeout_config: httpx.Timeout) -> httpx.Client:
+    """Creates an HTTP/2 capable client, falling back to HTTP/1.1 if 'h2' is not installed."""
+    try:
+        return httpx.Client(base_url=server_url, verify=verify_ssl, timeout=timeout_config, http2=True)
+    except ImportError:
+        logger.debug("Package 'h2' not installed, using HTTP/1.1. Install 'attackmate-client[http2]'.")
+        return httpx.Client(base_url=server_url, verify=verify_ssl, timeout=timeout_config)
+
+
+def _build_async_client(server_url: str, verify_ssl: Any, timeout_config: httpx.Timeout) -> httpx.AsyncClient:
+    """Async counterpart of _build_client."""
+    try:
+        return httpx.AsyncClient(base_url=server_url, verify=verify_ssl, timeout=timeout_config, http2=True)
+    except ImportError:
+        logger.debug("Package 'h2' not installed, using HTTP/1.1. Install 'attackmate-client[http2]'.")
+        return httpx.AsyncClient(base_url=server_url, verify=verify_ssl, timeout=timeout_config)
+
+
+def _get_shared_client(server_url: str, verify_ssl: Any, timeout_config: httpx.Timeout) -> httpx.Client:
+    """Returns the pooled httpx.Client for these settings, creating it if needed."""
+    key = _client_key(server_url, verify_ssl, timeout_config)
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+        if client is None or client.is_closed:
+            client = _build_client(server_url, verify_ssl, timeout_config)
+            _client_pool[key] = client
+            _client_refs[key] = 0
+        _client_refs[key] += 1
+        return client
+
+
+def _release_shared_client(server_url: str, verify_ssl: Any, timeout_config: httpx.Timeout) -> None:
+    """Drops one reference to a pooled client and closes it when it is no longer used."""
+    key = _client_key(server_url, verify_ssl, timeout_config)
+    with _client_pool_lock:
+        if key not in _client_refs:
+            return
+        _client_refs[key] -= 1
+        if _client_refs[key] > 0:
+            return
+        del _client_refs[key]
+        client = _client_pool.pop(key)
+    client.close()
+
+
+@atexit.register
+def _close_shared_clients() -> None:
+    """Closes all pooled clients at interpreter exit."""
+    with _client_pool_lock:
+        clients = list(_client_pool.values())
+        _client_pool.clear()
+        _client_refs.clear()
+    for client in clients:
+        client.close()
 
 
 class RemoteAttackMateClient:
@@ -27,6 +231,10 @@ class RemoteAttackMateClient:
     Handles authentication and token management internally per server URL.
     """
 
+    LOGIN_ENDPOINT = 'login'
+    PLAYBOOK_YAML_ENDPOINT = 'playbooks/execute/yaml'
+    COMMAND_ENDPOINT = 'command/execute'
+
     def __init__(
         self,
         server_url: str,
@@ -34,22 +242,76 @@ class RemoteAttackMateClient:
         password: SecretStr,
         cacert: Optional[str] = None,
         timeout: float = DEFAULT_TIMEOUT,
+        compress: bool = False,
     ):
         self.server_url = server_url.rstrip('/')
         self.username = username
         self.password = password
+        # Gzip YAML uploads; the server must accept 'Content-Encoding: gzip'
+        self.compress = compress
 
         self.timeout_config, self.verify_ssl = self._configure_http_settings(cacert, timeout)
+        # Persistent, pooled client so keep-alive connections (and their TLS sessions)
+        # are reused across requests instead of being re-established on every call.
+        self._client = _get_shared_client(self.server_url, self.verify_ssl, self.timeout_config)
+        self._closed = False
+        # The async client and the login lock (which coalesces concurrent logins) are bound to
+        # the event loop they are used in, so they are created lazily per instance and per loop.
+        self._aloop: Optional[asyncio.AbstractEventLoop] = None
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._alogin_lock: Optional[asyncio.Lock] = None
 
         logger.debug(f'RemoteClient initialized for {self.server_url}')
 
+    def close(self) -> None:
+        """Releases the shared HTTP client; it is closed once no other instance uses it."""
+        if self._closed:
+            return
+        self._closed = True
+        _release_shared_client(self.server_url, self.verify_ssl, self.timeout_config)
+
+    def __enter__(self) -> 'RemoteAttackMateClient':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def aclose(self) -> None:
+        """Closes the async HTTP client, if one was created in the running event loop."""
+        if self._aclient is not None and self._aloop is asyncio.get_running_loop():
+            await self._aclient.aclose()
+        self._aloop = None
+        self._aclient = None
+        self._alogin_lock = None
+
+    async def __aenter__(self) -> 'RemoteAttackMateClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+        self.close()
+
+    def _bind_event_loop(self) -> Tuple[httpx.AsyncClient, asyncio.Lock]:
+        """Returns the async client and login lock for the running loop, recreating them on a new loop."""
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._alogin_lock is None or self._aloop is not loop:
+            # Objects from a previous loop (e.g. an earlier asyncio.run()) cannot be reused there;
+            # its connections died with that loop, so the old client is simply dropped.
+            self._aloop = loop
+            self._aclient = _build_async_client(self.server_url, self.verify_ssl, self.timeout_config)
+            self._alogin_lock = asyncio.Lock()
+        return self._aclient, self._alogin_lock
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        return self._bind_event_loop()[0]
+
     def _configure_http_settings(self, cacert: Optional[str], timeout: float) -> Tuple[httpx.Timeout, Any]:
-        """Configures SSL verification and request timeout."""
-        timeout_config = httpx.Timeout(10.0, connect=5.0, read=timeout)
+        """Configures SSL verification and the timeout for API requests (e.g. playbook executions)."""
+        timeout_config = httpx.Timeout(timeout, connect=5.0)
 
         verify_ssl: Any = True  # Default to system CAs
         if cacert:
-            if os.path.exists(cacert):
+            if _resolve_verify(cacert) == cacert:
                 verify_ssl = cacert
                 logger.info(f'Client will verify {self.server_url} SSL using CA: {cacert}')
             else:
@@ -58,54 +320,125 @@ class RemoteAttackMateClient:
 
         return timeout_config, verify_ssl
 
-    def _get_session_token(self) -> Optional[str]:
-        """Retrieves a valid token for the server_url from memory, logs in if necessary."""
+    def _get_cached_session(self) -> Optional[Dict[str, Any]]:
+        """Returns the stored session (token and auth headers) for this server and user, if any."""
         with _sessions_lock:
-            token = _active_sessions.get((self.server_url, self.username))
-            if token:
-                logger.debug(f'Using existing token for {self.server_url} by user {self.username}')
-                return token
-
-        # If not, try login with credentials (outside lock — network I/O should not block other threads)
-        return self._login(self.username, self.password)
-
-    def _login(self, username: str, password: SecretStr) -> Optional[str]:
-        """Internal login method, stores token."""
-        login_url = f'{self.server_url}/login'
-        logger.info(f"Attempting login to {login_url} for user '{username}'...")
-        try:
-            with httpx.Client(verify=self.verify_ssl, timeout=self.timeout_config) as client:
-                response = client.post(
-                    login_url,
-                    data={
-                        'username': username,
-                        'password': password.get_secret_value(),
-                    },
+            session = _active_sessions.get((self.server_url, self.username))
+        if not session:
+            return None
+        if not _is_session_valid(session):
+            logger.debug('Token for %s by user %s expires soon, refreshing.', self.server_url, self.username)
+            return None
+        logger.debug('Using existing token for %s by user %s', self.server_url, self.username)
+        return session
+
+    def _get_session(self) -> Optional[Dict[str, Any]]:
+        """Retrieves a valid session for the server_url from memory, logs in if necessary."""
+        session = self._get_cached_session()
+        if session:
+            return session
+
+        session_key = (self.server_url, self.username)
+        with _sessions_lock:
+            login_lock = _login_locks.setdefault(session_key, threading.Lock())
+
+        # Only one thread per server and user logs in; network I/O happens outside _sessions_lock
+        with login_lock:
+            session = self._get_cached_session()
+            if session:
+                return session
+            return self._login(self.username, self.password)
+
+    def _evict_token(self, token: str) -> None:
+        """Removes a rejected token from the cache unless it was already replaced."""
+        session_key = (self.server_url, self.username)
+        with _sessions_lock:
+            session = _active_sessions.get(session_key)
+            if session and session['token'] == token:
+                del _active_sessions[session_key]
+
+    async def _aget_session(self) -> Optional[Dict[str, Any]]:
+        """Async variant of _get_session; concurrent callers share a single login."""
+        session = self._get_cached_session()
+        if session:
+            return session
+
+        async with self._bind_event_loop()[1]:
+            # Another coroutine may have logged in while we were waiting for the lock
+            session = self._get_cached_session()
+            if session:
+                return session
+            return await self._alogin(self.username, self.password)
+
+    def _handle_login_response(self, response: httpx.Response, username: str) -> Optional[Dict[str, Any]]:
+        """Extracts the token from a login response and stores it as the user's session."""
+        response.raise_for_status()
+        data = _parse_json(response)
+        token = data.get('access_token')
+
+        if not token:
+            logger.error(
+                f"Login to {self.server_url} succeeded but no token received (missing 'access_token').")
+            return None
+
+        # Store the token globally, guarded by the lock
+        with _sessions_lock:
+            # Re-check under lock: another thread may have logged in while we were waiting
+            session_key = (self.server_url, username)
+            existing_session = _active_sessions.get(session_key)
+            if existing_session and _is_session_valid(existing_session):
+                logger.debug(
+                    f"Token for '{username}' at {self.server_url} stored by another thread. "
+                    'Using existing token.'
                 )
+                return existing_session
+            session = {
+                'token': token,
+                'expires_at': _token_expiry(token, data),
+                'headers': _auth_headers(token),
+            }
+            _active_sessions[session_key] = session
+        logger.info(f"Login successful for '{username}' at {self.server_url}. Token stored.")
+        return session
+
+    def _login(self, username: str, password: SecretStr) -> Optional[Dict[str, Any]]:
+        """Internal login method, stores and returns the new session."""
+        logger.info(f"Attempting login to {self.server_url}/{self.LOGIN_ENDPOINT} for user '{username}'...")
+        try:
+            # Same pooled client (and SSL context) as all other requests, resolved against base_url
+            response = self._client.post(
+                self.LOGIN_ENDPOINT,
+                data={
+                    'username': username,
+                    'password': password.get_secret_value(),
+                },
+                timeout=LOGIN_TIMEOUT,
+            )
+            return self._handle_login_response(response, username)
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"Login failed for '{username}' at {self.server_url}: "
+                f'{e.response.status_code} - {e.response.text}'
+            )
+            return None
+        except Exception as e:
+            logger.error(f'Login request to {self.server_url} failed: {e}', exc_info=True)
+            return None
 
-            response.raise_for_status()
-            data = response.json()
-            token = data.get('access_token')
-
-            if token:
-                # Store the token globally, guarded by the lock
-                with _sessions_lock:
-                    # Re-check under lock: another thread may have logged in while we were waiting
-                    session_key = (self.server_url, username)
-                    existing_token = _active_sessions.get(session_key)
-                    if existing_token:
-                        logger.debug(
-                            f"Token for '{username}' at {self.server_url} stored by another thread. "
-                            'Using existing token.'
-                        )
-                        return existing_token
-                    _active_sessions[session_key] = token
-                logger.info(f"Login successful for '{username}' at {self.server_url}. Token stored.")
-                return token
-            else:
-                logger.error(
-                    f"Login to {self.server_url} succeeded but no token received (missing 'access_token').")
-                return None
+    async def _alogin(self, username: str, password: SecretStr) -> Optional[Dict[str, Any]]:
+        """Async variant of _login."""
+        logger.info(f"Attempting login to {self.server_url}/{self.LOGIN_ENDPOINT} for user '{username}'...")
+        try:
+            # Same pooled client (and SSL context) as all other requests, resolved against base_url
+            response = await self._get_async_client().post(
+                self.LOGIN_ENDPOINT,
+                data={
+                    'username': username,
+                    'password': password.get_secret_value(),
+                },
+                timeout=LOGIN_TIMEOUT,
+            )
+            return self._handle_login_response(response, username)
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"Login failed for '{username}' at {self.server_url}: "
@@ -118,17 +451,21 @@ class RemoteAttackMateClient:
 
     def _prepare_request_kwargs(
         self,
-        token: str,
+        auth_headers: Mapping[str, str],
         json_data: Optional[Dict[str, Any]] = None,
-        content_data: Optional[str] = None,
-        params: Optional[Dict[str, Any]] = None,
+        content_data: Optional[ContentData] = None,
+        params: Optional[Mapping[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Prepares headers and payload arguments for httpx.request."""
+        """Prepares headers and payload arguments for httpx.request.
+
+        auth_headers is the read-only mapping stored with the session; it is sent as it is for
+        JSON requests, so those do not build a headers dict per request.
+        """
 
-        headers: Dict[str, str] = {'X-Auth-Token': token}
+        headers = auth_headers
 
         if content_data is not None:
-            headers['Content-Type'] = 'application/yaml'
+            headers = {**headers, 'Content-Type': 'application/yaml'}
 
         request_kwargs: Dict[str, Any] = {
             'headers': headers,
@@ -137,102 +474,269 @@ class RemoteAttackMateClient:
 
         if json_data is not None:
             request_kwargs['json'] = json_data
+        elif isinstance(content_data, (str, bytes)):
+            compressed = _gzip_content(content_data) if self.compress else None
+            if compressed is not None:
+                request_kwargs['headers'] = {**headers, 'Content-Encoding': 'gzip'}
+                request_kwargs['content'] = compressed
+            else:
+                request_kwargs['content'] = content_data
         elif content_data is not None:
-            request_kwargs['content'] = content_data
+            stream_headers, request_kwargs['content'] = _stream_body(content_data, self.compress)
+            request_kwargs['headers'] = {**headers, **stream_headers}
 
         return request_kwargs
 
+    def _refresh_session(self, rejected_token: str) -> Optional[Dict[str, Any]]:
+        """Drops a token the server rejected with 401 and obtains a new session."""
+        logger.warning(f'Token expired or invalid for {self.server_url}. Refreshing session token.')
+        self._evict_token(rejected_token)
+        return self._get_session()
+
+    async def _arefresh_session(self, rejected_token: str) -> Optional[Dict[str, Any]]:
+        """Async variant of _refresh_session."""
+        logger.warning(f'Token expired or invalid for {self.server_url}. Refreshing session token.')
+        self._evict_token(rejected_token)
+        return await self._aget_session()
+
+    def _log_api_error(self, method: str, url: str, response: httpx.Response) -> None:
+        """Logs an HTTP error status together with the server's error detail."""
+        error_detail = None
+        # Only JSON error bodies carry a 'detail'; plain text errors (e.g. from a proxy) skip parsing
+        if 'json' in response.headers.get('content-type', ''):
+            try:
+                body = _parse_json(response)
+            except orjson.JSONDecodeError:
+                body = None
+            if isinstance(body, dict):
+                error_detail = body.get('detail')
+
+        if error_detail:
+            logger.error(f'API Error ({method} {url}): {response.status_code} - {error_detail}')
+        else:
+            logger.error(f'API Error ({method} {url}): {response.status_code}')
+            logger.error(f'Server Response Text: {response.text}')
+
+    def _dispatch(
+        self,
+        method: str,
+        path: str,
+        auth_headers: Mapping[str, str],
+        request_body: Dict[str, Any],
+    ) -> Any:
+        """Sends a single authenticated request and returns the parsed JSON body.
+
+        The body is streamed into one buffer and parsed from there, instead of letting httpx
+        collect the chunks and join them into a second copy. Raises on HTTP error statuses.
+        """
+        kwargs = self._prepare_request_kwargs(auth_headers, **request_body)
+        logger.debug('Making %s request to %s/%s', method, self.server_url, path)
+        with self._client.stream(method=method, url=path, timeout=self.timeout_config, **kwargs) as response:
+            if not response.is_success:
+                response.read()  # error handling needs the body after the stream is closed
+                response.raise_for_status()
+            body = bytearray()
+            for chunk in response.iter_bytes(RESPONSE_CHUNK_SIZE):
+                body.extend(chunk)
+        return orjson.loads(body)
+
+    async def _adispatch(
+        self,
+        method: str,
+        path: str,
+        auth_headers: Mapping[str, str],
+        request_body: Dict[str, Any],
+    ) -> Any:
+        """Async variant of _dispatch."""
+        kwargs = self._prepare_request_kwargs(auth_headers, **request_body)
+        logger.debug('Making %s request to %s/%s', method, self.server_url, path)
+        async with self._get_async_client().stream(
+                method=method, url=path, timeout=self.timeout_config, **kwargs) as response:
+            if not response.is_success:
+                await response.aread()
+                response.raise_for_status()
+            body = bytearray()
+            async for chunk in response.aiter_bytes(RESPONSE_CHUNK_SIZE):
+                body.extend(chunk)
+        return orjson.loads(body)
+
     def _make_authenticated_request(
         self,
         method: str,
         endpoint: str,
         json_data: Optional[Dict[str, Any]] = None,
-        content_data: Optional[str] = None,
-        params: Optional[Dict[str, Any]] = None,
+        content_data: Optional[ContentData] = None,
+        params: Optional[Mapping[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
-        """Makes an authenticated request, handles token renewal on 401."""
-        token = self._get_session_token()
-        if not token:
+        """Makes an authenticated request; on 401 refreshes the token and retries once."""
+        return self._send_request(
+            method.upper(),
+            endpoint.lstrip('/'),  # resolved against the client's base_url
+            json_data=json_data,
+            content_data=content_data,
+            params=params,
+        )
+
+    def _send_request(
+        self,
+        method: str,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        content_data: Optional[ContentData] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """_make_authenticated_request for an upper-case method and a path without leading '/'."""
+        session = self._get_session()
+        if not session:
             logger.error(f'Authentication failed or credentials not provided for {self.server_url}')
             return None
 
-        url = f"{self.server_url}/{endpoint.lstrip('/')}"
-        client_method = method.upper()
-
-        def _dispatch_request(explicit_token: str) -> httpx.Response:
-            kwargs = self._prepare_request_kwargs(
-                token=explicit_token,
-                json_data=json_data,
-                content_data=content_data,
-                params=params,
-            )
-            logger.debug(f'Making {client_method} request to {url}')
-            with httpx.Client(verify=self.verify_ssl, timeout=self.timeout_config) as client:
-                response = client.request(method=client_method, url=url, **kwargs)
-            response.raise_for_status()
-            return response
+        request_body = {'json_data': json_data, 'content_data': content_data, 'params': params}
+        # A streamed file is consumed by the request; remember where it starts so a retry can rewind.
+        # Pipes, stdin and sockets cannot be rewound (stream_start stays None).
+        stream = None if content_data is None or isinstance(content_data, (str, bytes)) else content_data
+        stream_start = stream.tell() if stream is not None and stream.seekable() else None
 
         try:
-            return _dispatch_request(explicit_token=token).json()
-
-        except httpx.HTTPStatusError as e:
-            status = e.response.status_code
             try:
-                error_detail = e.response.json().get('detail', e.response.text)
-            except json.JSONDecodeError:
-                error_detail = e.response.text
-
-            if status == 401:
-                logger.warning(f'Token expired or invalid for {self.server_url}. Clearing session cache.')
-                with _sessions_lock:
-                    _active_sessions.pop((self.server_url, self.username), None)
-
-                new_token = self._login(self.username, self.password)
-                if new_token:
-                    try:
-                        return _dispatch_request(explicit_token=new_token).json()
-                    except Exception as retry_e:
+                result = self._dispatch(method, path, session['headers'], request_body)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 401:
+                    raise
+                # Only one retry: a second 401 is reported like any other API error
+                new_session = self._refresh_session(session['token'])
+                if not new_session:
+                    logger.error(f'Re-authentication failed for {self.server_url}')
+                    return None
+                if stream is not None:
+                    if stream_start is None:
                         logger.error(
-                            f'Retry after re-login failed ({method} {url}): {retry_e}',
-                            exc_info=True,
+                            f'Cannot retry request to {self.server_url}/{path}: '
+                            'the non-seekable request body was already consumed.'
                         )
-                raise ExecException(f'Authentication failed for {self.server_url}.')
+                        return None
+                    stream.seek(stream_start)
+                result = self._dispatch(method, path, new_session['headers'], request_body)
+            return result
+
+        except httpx.HTTPStatusError as e:
+            self._log_api_error(method, f'{self.server_url}/{path}', e.response)
+            return None
+        except httpx.RequestError as e:
+            logger.error(f'Request Error ({method} {self.server_url}/{path}): {e}')
+            return None
+        except (json.JSONDecodeError, orjson.JSONDecodeError):
+            logger.error(f'JSON Decode Error ({method} {self.server_url}/{path}). Invalid response received.')
+            return None
+        except Exception as e:
+            logger.error(
+                f'Unexpected error during API request ({method} {self.server_url}/{path}): {e}',
+                exc_info=True,
+            )
+            return None
 
-            raise ExecException(f'API Error ({status}): {error_detail}')
+    async def _asend_request(
+        self,
+        method: str,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        content_data: Optional[Union[str, bytes]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of _send_request; file objects are not supported as content."""
+        request_body = {'json_data': json_data, 'content_data': content_data, 'params': params}
 
+        try:
+            session = await self._aget_session()
+            if not session:
+                logger.error(f'Authentication failed or credentials not provided for {self.server_url}')
+                return None
+            try:
+                result = await self._adispatch(method, path, session['headers'], request_body)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 401:
+                    raise
+                # Only one retry: a second 401 is reported like any other API error
+                new_session = await self._arefresh_session(session['token'])
+                if not new_session:
+                    logger.error(f'Re-authentication failed for {self.server_url}')
+                    return None
+                result = await self._adispatch(method, path, new_session['headers'], request_body)
+            return result
+
+        except httpx.HTTPStatusError as e:
+            self._log_api_error(method, f'{self.server_url}/{path}', e.response)
+            return None
         except httpx.RequestError as e:
-            logger.error(f'Request Error ({method} {url}): {e}')
+            logger.error(f'Request Error ({method} {self.server_url}/{path}): {e}')
             return None
-        except json.JSONDecodeError:
-            logger.error(f'JSON Decode Error ({method} {url}). Invalid response received.')
+        except (json.JSONDecodeError, orjson.JSONDecodeError):
+            logger.error(f'JSON Decode Error ({method} {self.server_url}/{path}). Invalid response received.')
             return None
         except Exception as e:
-            logger.error(f'Unexpected error during API request ({method} {url}): {e}', exc_info=True)
+            logger.error(
+                f'Unexpected error during API request ({method} {self.server_url}/{path}): {e}',
+                exc_info=True,
+            )
             return None
 
     def execute_remote_playbook_yaml(
-        self, playbook_yaml_content: str, debug: bool = False
+        self, playbook_yaml_content: ContentData, debug: bool = False
     ) -> Optional[Dict[str, Any]]:
-        """Executes a playbook by sending its YAML content."""
-        params = {'debug': 'true'} if debug else None
-        return self._make_authenticated_request(
+        """Executes a playbook by sending its YAML content (str, bytes or a binary file object)."""
+        params = _DEBUG_PARAMS if debug else None
+        return self._send_request(
             method='POST',
-            endpoint='playbooks/execute/yaml',
+            path=self.PLAYBOOK_YAML_ENDPOINT,
             content_data=playbook_yaml_content,
             params=params,
         )
 
+    @staticmethod
+    def _command_body(command: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+        """Returns the JSON body for a command; plain dicts are sent as they are."""
+        if isinstance(command, dict):
+            return command
+        return command.model_dump(exclude_none=True)
+
     def execute_remote_command(
         self,
-        command_pydantic_model,
+        command_pydantic_model: Union[BaseModel, Dict[str, Any]],
+        debug: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Executes a single command by sending a Pydantic model (or a pre-dumped dict) as JSON."""
+        command_body_dict = self._command_body(command_pydantic_model)
+        params = _DEBUG_PARAMS if debug else None
+        return self._send_request(
+            method='POST',
+            path=self.COMMAND_ENDPOINT,
+            json_data=command_body_dict,
+            params=params,
+        )
+
+    async def aexecute_remote_playbook_yaml(
+        self, playbook_yaml_content: Union[str, bytes], debug: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of execute_remote_playbook_yaml; takes str or bytes, not file objects."""
+        params = _DEBUG_PARAMS if debug else None
+        return await self._asend_request(
+            method='POST',
+            path=self.PLAYBOOK_YAML_ENDPOINT,
+            content_data=playbook_yaml_content,
+            params=params,
+        )
+
+    async def aexecute_remote_command(
+        self,
+        command_pydantic_model: Union[BaseModel, Dict[str, Any]],
         debug: bool = False,
     ) -> Optional[Dict[str, Any]]:
-        """Executes a single command by sending a Pydantic model as JSON."""
-        command_body_dict = command_pydantic_model.model_dump(exclude_none=True)
-        params = {'debug': 'true'} if debug else None
-        return self._make_authenticated_request(
+        """Async variant of execute_remote_command, e.g. for use with asyncio.gather()."""
+        command_body_dict = self._command_body(command_pydantic_model)
+        params = _DEBUG_PARAMS if debug else None
+        return await self._asend_request(
             method='POST',
-            endpoint='command/execute',
+            path=self.COMMAND_ENDPOINT,
             json_data=command_body_dict,
             params=params,
         )
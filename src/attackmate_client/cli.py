@@ -16,6 +16,13 @@ from pydantic import SecretStr
 
 from attackmate_client import RemoteAttackMateClient
 
+# libyaml is a soft dependency: use PyYAML's C-backed dumper when it is available. The playbook
+# itself is never parsed here; it is uploaded as-is, so no loader is needed.
+try:
+    from yaml import CSafeDumper as _YAMLDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YAMLDumper  # type: ignore[assignment]
+
 logger = logging.getLogger('playbook')
 
 
@@ -36,7 +43,7 @@ def print_result(result_data: Optional[Dict[str, Any]], action: str) -> None:
     final_state = result_data.get('final_state')
     if final_state and final_state.get('variables'):
         print('\n--- Final Variable Store State ---')
-        print(yaml.safe_dump(final_state['variables'], indent=2, default_flow_style=False))
+        print(yaml.dump(final_state['variables'], Dumper=_YAMLDumper, indent=2, default_flow_style=False))
 
     if not result_data.get('success'):
         sys.exit(1)
@@ -61,6 +68,11 @@ def build_parser() -> argparse.ArgumentParser:
         '--cacert',
         help="Path to the server's self-signed certificate file for verification.",
     )
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='Gzip-compress playbooks larger than 4 KiB (the server must accept gzip request bodies).',
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -83,16 +95,19 @@ def main() -> None:
         username=args.username,
         password=SecretStr(args.password),
         cacert=args.cacert,
+        compress=args.compress,
     )
 
     try:
-        with open(args.playbook_file, 'r') as f:
-            yaml_content = f.read()
-        result = client.execute_remote_playbook_yaml(yaml_content, args.debug)
+        # Stream the file to the server instead of reading it into memory first
+        with open(args.playbook_file, 'rb') as f:
+            result = client.execute_remote_playbook_yaml(f, args.debug)
         print_result(result, f'Playbook Execution (YAML: {args.playbook_file})')
     except IOError as e:
         logger.error(f'Failed to read file: {e}')
         sys.exit(1)
+    finally:
+        client.close()
 
 
 if __name__ == '__main__':
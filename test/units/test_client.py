@@ -1,23 +1,48 @@
 import pytest
+import asyncio
+import base64
+import gzip
+import io
 import json
 import logging
+import os
+import threading
+import time
 import httpx
 from unittest import mock
-from typing import Dict, Any, Optional
+from typing import Dict, Any, MutableMapping, Optional
 from pydantic import SecretStr
 from attackmate_client.attackmate_client import (
     RemoteAttackMateClient,
     _active_sessions,
+    _auth_headers,
+    _build_client,
+    _client_pool,
+    _login_locks,
+    _close_shared_clients,
+    _resolve_verify,
+    _session_ttu,
+    _token_expiry,
     DEFAULT_TIMEOUT,
+    LOGIN_TIMEOUT,
+    MAX_SESSIONS,
+    SESSION_MAX_TTL,
 )
 
 
 @pytest.fixture(autouse=True)
-def clear_sessions() -> dict[tuple[str, str], str]:
+def clear_sessions() -> MutableMapping[tuple[str, str], dict[str, Any]]:
     """Fixture to ensure the global session cache is empty before each test."""
     _active_sessions.clear()
     return _active_sessions
 
+
+@pytest.fixture(autouse=True)
+def clear_client_pool():
+    """Fixture to close and forget pooled HTTP clients after each test."""
+    yield
+    _close_shared_clients()
+
 # Define a simple mock class that resembles a Pydantic model instance
 
 
@@ -31,7 +56,7 @@ class MockCommandModel:
         if exclude_none:
             return {k: v for k, v in self._data.items() if v is not None}
         return self._data
-# Helper function to simulate httpx responses
+# Helper functions to simulate httpx responses
 
 
 def mock_response(
@@ -43,24 +68,43 @@ def mock_response(
     response = mock.MagicMock(spec=httpx.Response)
     response.status_code = status_code
     response.text = text
+    response.is_success = 200 <= status_code < 300
+    response.headers = httpx.Headers(
+        {'content-type': 'application/json' if json_data is not None else 'text/plain'}
+    )
+    # The client parses response.content with orjson; non-JSON text makes parsing fail
+    response.content = json.dumps(json_data).encode() if json_data is not None else text.encode()
+    response.iter_bytes.side_effect = lambda chunk_size=None: iter([response.content])
+
+    async def aiter_bytes(chunk_size=None):
+        yield response.content
+
+    response.aiter_bytes.side_effect = aiter_bytes
+    response.aread = mock.AsyncMock(return_value=response.content)
     response.raise_for_status.side_effect = None
     if 400 <= status_code < 600:
         response.raise_for_status.side_effect = httpx.HTTPStatusError(
             f'{status_code} Error', request=mock.MagicMock(), response=response
         )
-    if json_data is not None:
-        response.json.return_value = json_data
+    return response
+
+
+def framed_body(request: httpx.Request) -> bytes:
+    """Returns the body httpx sent, checking it matches the declared Content-Length or is chunked."""
+    body = request.read()
+    if 'Content-Length' in request.headers:
+        assert int(request.headers['Content-Length']) == len(body)
     else:
-        # Ensure json() call fails for non-JSON content or success with empty body
-        response.json.side_effect = (
-            json.JSONDecodeError('No JSON content', doc=text or 'None', pos=0)
-            if status_code != 204 and not json_data
-            else None
-        )
-        if status_code == 200 and not text and not json_data:
-            response.json.return_value = {}
+        assert request.headers['Transfer-Encoding'] == 'chunked'
+    return body
 
-    return response
+
+def mock_stream(response: httpx.Response) -> mock.MagicMock:
+    """Wraps a mock response in the (async) context manager returned by client.stream()."""
+    stream_cm = mock.MagicMock()
+    stream_cm.__enter__.return_value = response
+    stream_cm.__aenter__.return_value = response
+    return stream_cm
 
 
 class TestRemoteAttackMateClient:
@@ -80,6 +124,54 @@ class TestRemoteAttackMateClient:
         assert client.verify_ssl is True
         assert client.timeout_config.read == DEFAULT_TIMEOUT
 
+    def test_resolve_verify_is_cached(self) -> None:
+        """Test that the CA file lookup falls back to system CAs and is done once per path."""
+        _resolve_verify.cache_clear()
+        with mock.patch('os.path.exists', side_effect=lambda path: path == '/certs/ca.pem') as exists:
+            assert _resolve_verify('/certs/ca.pem') == '/certs/ca.pem'
+            assert _resolve_verify('/certs/ca.pem') == '/certs/ca.pem'
+            assert _resolve_verify('/certs/missing.pem') is True
+
+        assert exists.call_count == 2
+
+    def test_context_manager_closes_client(self) -> None:
+        """Test that the persistent HTTP client is closed when leaving the context."""
+        with RemoteAttackMateClient(
+            self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
+        ) as client:
+            assert client._client.base_url == self.SERVER_URL
+            assert not client._client.is_closed
+        assert client._client.is_closed
+
+    def test_instances_share_client_pool(self) -> None:
+        """Test that instances with the same connection settings share one HTTP client."""
+        client_alice = RemoteAttackMateClient(self.SERVER_URL, username='alice', password=self.PASSWORD)
+        client_bob = RemoteAttackMateClient(self.SERVER_URL, username='bob', password=self.PASSWORD)
+        client_other = RemoteAttackMateClient(
+            self.SERVER_URL, username='alice', password=self.PASSWORD, timeout=5.0
+        )
+        assert client_alice._client is client_bob._client
+        assert client_other._client is not client_alice._client
+        assert len(_client_pool) == 2
+
+        # The shared client stays open until its last user releases it
+        client_alice.close()
+        assert not client_bob._client.is_closed
+        client_bob.close()
+        assert client_bob._client.is_closed
+
+    @mock.patch('httpx.Client')
+    def test_build_client_falls_back_to_http1(self, MockClient) -> None:
+        """Test that a missing 'h2' package falls back to an HTTP/1.1 client."""
+        fallback = mock.MagicMock()
+        MockClient.side_effect = [ImportError('h2 not installed'), fallback]
+
+        client = _build_client(self.SERVER_URL, True, httpx.Timeout(10.0))
+
+        assert client is fallback
+        assert MockClient.call_args_list[0].kwargs['http2'] is True
+        assert 'http2' not in MockClient.call_args_list[1].kwargs
+
     def test_prepare_request_kwargs_json(self) -> None:
         """Test request preparation for JSON payload."""
         token = '2345'
@@ -87,23 +179,134 @@ class TestRemoteAttackMateClient:
         params = {'q': 'search'}
         kwargs = RemoteAttackMateClient(
             self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
-        )._prepare_request_kwargs(token, json_data=json_data, params=params)
+        )._prepare_request_kwargs(_auth_headers(token), json_data=json_data, params=params)
         assert kwargs['headers'] == {'X-Auth-Token': token}
         assert kwargs['json'] == json_data
         assert kwargs['params'] == params
         assert 'content' not in kwargs
 
+    def test_prepare_request_kwargs_reuses_auth_headers(self) -> None:
+        """Test that JSON requests send the session's read-only headers mapping without copying it."""
+        client = RemoteAttackMateClient(self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD)
+        login_response = mock_response(json_data={'access_token': 'abc'})
+        session = client._handle_login_response(login_response, self.USERNAME)
+        assert session is not None
+        first = client._prepare_request_kwargs(session['headers'], json_data={})
+        second = client._prepare_request_kwargs(session['headers'], json_data={})
+        assert first['headers'] is second['headers'] is session['headers']
+        with pytest.raises(TypeError):
+            first['headers']['X-Auth-Token'] = 'other'
+
+    def test_evicted_token_headers_are_not_retained(self, clear_sessions) -> None:
+        """Test that evicting a token drops the auth headers built for it, and a new login builds new ones."""
+        client = RemoteAttackMateClient(self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD)
+        with mock.patch.object(client, '_client') as mock_http:
+            mock_http.post.return_value = mock_response(json_data={'access_token': 'abc'})
+            session = client._get_session()
+            assert session is not None
+            assert client._get_session() is session
+
+            client._evict_token('abc')
+            assert not clear_sessions
+            mock_http.post.return_value = mock_response(json_data={'access_token': 'def'})
+            new_session = client._get_session()
+
+        assert new_session is not None
+        assert new_session['headers'] == {'X-Auth-Token': 'def'}
+        assert all(stored['headers'] is not session['headers'] for stored in clear_sessions.values())
+
     def test_prepare_request_kwargs_yaml(self) -> None:
         """Test request preparation for YAML/content payload."""
         token = '12345'
         content_data = 'playbook: []'
         kwargs = RemoteAttackMateClient(
             self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
-        )._prepare_request_kwargs(token, content_data=content_data)
+        )._prepare_request_kwargs(_auth_headers(token), content_data=content_data)
         assert kwargs['headers'] == {'X-Auth-Token': token, 'Content-Type': 'application/yaml'}
         assert kwargs['content'] == content_data
         assert 'json' not in kwargs
 
+    def test_prepare_request_kwargs_compressed(self) -> None:
+        """Test that large YAML uploads are gzip-compressed when compression is enabled."""
+        client = RemoteAttackMateClient(
+            self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD, compress=True
+        )
+        content_data = 'commands:\n' + '  - type: shell\n    cmd: whoami\n' * 500
+
+        kwargs = client._prepare_request_kwargs(_auth_headers('12345'), content_data=content_data)
+
+        assert kwargs['headers']['Content-Encoding'] == 'gzip'
+        assert kwargs['headers']['Content-Type'] == 'application/yaml'
+        assert gzip.decompress(kwargs['content']).decode() == content_data
+        # Small bodies are not worth compressing
+        small = client._prepare_request_kwargs(_auth_headers('12345'), content_data='commands: []')
+        assert small['content'] == 'commands: []'
+        assert 'Content-Encoding' not in small['headers']
+
+    def test_prepare_request_kwargs_compress_threshold_counts_bytes(self) -> None:
+        """Test that the compression threshold compares encoded bytes, not characters."""
+        client = RemoteAttackMateClient(
+            self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD, compress=True
+        )
+        content_data = 'ä' * 3000  # 3000 characters, 6000 bytes
+
+        kwargs = client._prepare_request_kwargs(_auth_headers('12345'), content_data=content_data)
+
+        assert kwargs['headers']['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(kwargs['content']).decode() == content_data
+
+    def test_prepare_request_kwargs_small_file_not_compressed(self, tmp_path, clear_sessions) -> None:
+        """Test that small playbook files are streamed uncompressed, large ones compressed."""
+        client = RemoteAttackMateClient(
+            self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD, compress=True
+        )
+        small = tmp_path / 'small.yml'
+        small.write_bytes(b'commands: []\n')
+        large = tmp_path / 'large.yml'
+        large.write_bytes(b'commands:\n' + b'  - type: debug\n' * 1000)
+
+        with open(small, 'rb') as f:
+            kwargs = client._prepare_request_kwargs(_auth_headers('12345'), content_data=f)
+            assert b''.join(kwargs['content']) == small.read_bytes()
+            assert kwargs['headers']['Content-Length'] == str(small.stat().st_size)
+            assert 'Content-Encoding' not in kwargs['headers']
+        with open(large, 'rb') as f:
+            kwargs = client._prepare_request_kwargs(_auth_headers('12345'), content_data=f)
+            assert kwargs['headers']['Content-Encoding'] == 'gzip'
+            assert gzip.decompress(b''.join(kwargs['content'])) == large.read_bytes()
+
+        # Both bodies must also go over the wire with framing that matches what is sent
+        sent_bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = framed_body(request)
+            if request.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            sent_bodies.append(body)
+            return httpx.Response(200, json={'ok': True})
+
+        clear_sessions[(self.SERVER_URL, self.USERNAME)] = {
+            'token': '12345', 'expires_at': None, 'headers': _auth_headers('12345')}
+        with httpx.Client(base_url=self.SERVER_URL, transport=httpx.MockTransport(handler)) as http, \
+                mock.patch.object(client, '_client', http):
+            for path in (small, large):
+                with open(path, 'rb') as f:
+                    assert client.execute_remote_playbook_yaml(f) == {'ok': True}
+
+        assert sent_bodies == [small.read_bytes(), large.read_bytes()]
+
+    def test_prepare_request_kwargs_compressed_stream(self) -> None:
+        """Test that a streamed playbook file is compressed chunk by chunk."""
+        client = RemoteAttackMateClient(
+            self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD, compress=True
+        )
+        raw = b'commands:\n' + b'  - type: debug\n' * 10000
+
+        kwargs = client._prepare_request_kwargs(_auth_headers('12345'), content_data=io.BytesIO(raw))
+
+        assert kwargs['headers']['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(b''.join(kwargs['content'])) == raw
+
 
 class TestClientLogin:
 
@@ -112,52 +315,52 @@ class TestClientLogin:
     PASSWORD = SecretStr('testpassword')
     TOKEN = 'test_token_123'
 
-    @mock.patch('httpx.Client')
-    def test_login_success(self, MockClient, clear_sessions):
+    def test_login_success(self, clear_sessions):
         """Test successful login, token caching, and return."""
         mock_response_instance = mock_response(
             json_data={'access_token': self.TOKEN, 'user': self.USERNAME}
         )
-        MockClient.return_value.__enter__.return_value.post.return_value = mock_response_instance
-
         client = RemoteAttackMateClient(
             self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
         )
-        token = client._login(self.USERNAME, self.PASSWORD)
-
-        assert token == self.TOKEN
+        with mock.patch.object(client, '_client') as mock_http:
+            mock_http.post.return_value = mock_response_instance
+            session = client._login(self.USERNAME, self.PASSWORD)
+
+        assert session is not None
+        assert session['token'] == self.TOKEN
+        assert session['headers'] == {'X-Auth-Token': self.TOKEN}
+        # Login goes through the persistent client, relative to its base_url
+        assert mock_http.post.call_args.args == ('login',)
+        # Login uses its own short timeout, independent of the execution timeout
+        assert mock_http.post.call_args.kwargs['timeout'] is LOGIN_TIMEOUT
         # Session is keyed by (server_url, username)
-        assert clear_sessions[(self.SERVER_URL, self.USERNAME)] == self.TOKEN
+        assert clear_sessions[(self.SERVER_URL, self.USERNAME)]['token'] == self.TOKEN
 
-    @mock.patch('httpx.Client')
-    def test_login_401_failure(self, MockClient, caplog, clear_sessions) -> None:
+    def test_login_401_failure(self, caplog, clear_sessions) -> None:
         """Test login failure due to 401 Unauthorized status."""
         mock_response_instance = mock_response(status_code=401, text='Invalid credentials')
-        MockClient.return_value.__enter__.return_value.post.return_value = mock_response_instance
-
         client = RemoteAttackMateClient(
             self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
         )
-        with caplog.at_level(logging.ERROR):
-            token = client._login(self.USERNAME, self.PASSWORD)
+        with mock.patch.object(client, '_client') as mock_http, caplog.at_level(logging.ERROR):
+            mock_http.post.return_value = mock_response_instance
+            session = client._login(self.USERNAME, self.PASSWORD)
 
-        assert token is None
+        assert session is None
         assert not clear_sessions
         assert "Login failed for 'testuser'" in caplog.text
 
-    @mock.patch('httpx.Client')
-    def test_login_different_users_dont_evict_each_other(self, MockClient, clear_sessions):
+    def test_login_different_users_dont_evict_each_other(self, clear_sessions):
         """Test that two users on the same server get independent cache entries."""
         token_alice = 'token_alice'
         token_bob = 'token_bob'
 
-        def post_side_effect(url, data):
+        def post_side_effect(url, data, **kwargs):
             if data['username'] == 'alice':
                 return mock_response(json_data={'access_token': token_alice})
             return mock_response(json_data={'access_token': token_bob})
 
-        MockClient.return_value.__enter__.return_value.post.side_effect = post_side_effect
-
         client_alice = RemoteAttackMateClient(
             self.SERVER_URL, username='alice', password=SecretStr('pw')
         )
@@ -165,12 +368,102 @@ class TestClientLogin:
             self.SERVER_URL, username='bob', password=SecretStr('pw')
         )
 
-        client_alice._login('alice', SecretStr('pw'))
-        client_bob._login('bob', SecretStr('pw'))
+        with mock.patch.object(client_alice, '_client') as http_alice, \
+                mock.patch.object(client_bob, '_client') as http_bob:
+            http_alice.post.side_effect = post_side_effect
+            http_bob.post.side_effect = post_side_effect
+            client_alice._login('alice', SecretStr('pw'))
+            client_bob._login('bob', SecretStr('pw'))
 
         # Both tokens must coexist independently
-        assert clear_sessions[(self.SERVER_URL, 'alice')] == token_alice
-        assert clear_sessions[(self.SERVER_URL, 'bob')] == token_bob
+        assert clear_sessions[(self.SERVER_URL, 'alice')]['token'] == token_alice
+        assert clear_sessions[(self.SERVER_URL, 'bob')]['token'] == token_bob
+
+    def test_token_expiry_from_expires_in(self) -> None:
+        """Test that 'expires_in' from the login response determines the expiry."""
+        before = time.time()
+        expires_at = _token_expiry('opaque-token', {'expires_in': 600})
+        assert expires_at is not None
+        assert before + 600 <= expires_at <= time.time() + 600
+
+    def test_token_expiry_from_jwt_claim(self) -> None:
+        """Test that the JWT 'exp' claim is used when 'expires_in' is missing."""
+        payload = base64.urlsafe_b64encode(json.dumps({'exp': 1700000000}).encode()).rstrip(b'=')
+        jwt = f'header.{payload.decode()}.signature'
+        assert _token_expiry(jwt, {}) == 1700000000.0
+        assert _token_expiry('not-a-jwt', {}) is None
+
+    def test_expiring_token_is_refreshed_proactively(self, clear_sessions):
+        """Test that a token close to expiry triggers a new login instead of being used."""
+        clear_sessions[(self.SERVER_URL, self.USERNAME)] = {
+            'token': 'old_token',
+            'expires_at': time.time() + 5,
+        }
+        client = RemoteAttackMateClient(
+            self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
+        )
+        with mock.patch.object(client, '_client') as mock_http:
+            mock_http.post.return_value = mock_response(
+                json_data={'access_token': self.TOKEN, 'expires_in': 3600}
+            )
+            session = client._get_session()
+
+        assert session is not None
+        assert session['token'] == self.TOKEN
+        mock_http.post.assert_called_once()
+        assert clear_sessions[(self.SERVER_URL, self.USERNAME)]['expires_at'] > time.time() + 3000
+
+    def test_expired_sessions_are_evicted(self, clear_sessions):
+        """Test that the session cache drops expired tokens and falls back to a max TTL."""
+        now = time.time()
+        clear_sessions[(self.SERVER_URL, 'expired')] = {'token': 'a', 'expires_at': now - 1}
+        clear_sessions[(self.SERVER_URL, 'valid')] = {'token': 'b', 'expires_at': now + 600}
+        clear_sessions[(self.SERVER_URL, 'unknown')] = {'token': 'c', 'expires_at': None}
+
+        assert (self.SERVER_URL, 'expired') not in clear_sessions
+        assert clear_sessions[(self.SERVER_URL, 'valid')]['token'] == 'b'
+
+        assert clear_sessions[(self.SERVER_URL, 'unknown')]['token'] == 'c'
+        # Without a known expiry, a session is kept for SESSION_MAX_TTL seconds
+        assert _session_ttu((self.SERVER_URL, 'unknown'), {'expires_at': None}, now) == now + SESSION_MAX_TTL
+
+    def test_login_locks_are_bounded(self, clear_sessions):
+        """Test that per-user login locks do not accumulate beyond the session cache size."""
+        for i in range(MAX_SESSIONS + 10):
+            client = RemoteAttackMateClient(self.SERVER_URL, username=f'user{i}', password=self.PASSWORD)
+            with mock.patch.object(client, '_client') as mock_http:
+                mock_http.post.return_value = mock_response(json_data={'access_token': f'token{i}'})
+                client._get_session()
+
+        assert len(_login_locks) == MAX_SESSIONS
+
+    def test_concurrent_threads_share_one_login(self, clear_sessions):
+        """Test that threads requesting a token at the same time trigger a single login."""
+        client = RemoteAttackMateClient(
+            self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
+        )
+        barrier = threading.Barrier(5)
+        tokens = []
+
+        def slow_login(url, data, **kwargs):
+            threading.Event().wait(0.05)
+            return mock_response(json_data={'access_token': self.TOKEN})
+
+        def get_token():
+            barrier.wait()
+            session = client._get_session()
+            tokens.append(session['token'] if session else None)
+
+        with mock.patch.object(client, '_client') as mock_http:
+            mock_http.post.side_effect = slow_login
+            threads = [threading.Thread(target=get_token) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert tokens == [self.TOKEN] * 5
+        mock_http.post.assert_called_once()
 
 
 class TestClientMakeRequest:
@@ -185,38 +478,141 @@ class TestClientMakeRequest:
     def setup_client(self, clear_sessions) -> RemoteAttackMateClient:
         """Setup client with a pre-cached token to skip login."""
         # Compound key: (server_url, username)
-        clear_sessions[(self.SERVER_URL, self.USERNAME)] = self.TOKEN
+        clear_sessions[(self.SERVER_URL, self.USERNAME)] = {
+            'token': self.TOKEN, 'expires_at': None, 'headers': _auth_headers(self.TOKEN)}
         return RemoteAttackMateClient(
             self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
         )
 
-    @mock.patch('httpx.Client')
-    def test_make_request_success(self, MockClient, setup_client) -> None:
+    def test_make_request_success(self, setup_client) -> None:
         """Test successful GET request."""
         endpoint = 'status'
         expected_result = {'status': 'ok'}
         mock_response_instance = mock_response(json_data=expected_result)
-        MockClient.return_value.__enter__.return_value.request.return_value = mock_response_instance
 
-        result = setup_client._make_authenticated_request(method='GET', endpoint=endpoint)
+        with mock.patch.object(setup_client, '_client') as mock_http:
+            mock_http.stream.return_value = mock_stream(mock_response_instance)
+            result = setup_client._make_authenticated_request(method='GET', endpoint=endpoint)
 
         assert result == expected_result
-        MockClient.return_value.__enter__.return_value.request.assert_called_once()
+        mock_http.stream.assert_called_once()
+        assert mock_http.stream.call_args.kwargs['timeout'].read == DEFAULT_TIMEOUT
+        # Requests are issued relative to the persistent client's base_url
+        assert mock_http.stream.call_args.kwargs['url'] == 'status'
+
+    @mock.patch.object(RemoteAttackMateClient, '_send_request')
+    def test_make_request_normalizes_method_and_endpoint(self, mock_send_request, setup_client) -> None:
+        """Test that the method is upper-cased and the endpoint made relative once per call."""
+        setup_client._make_authenticated_request(method='get', endpoint='/status')
+
+        mock_send_request.assert_called_once_with(
+            'GET', 'status', json_data=None, content_data=None, params=None
+        )
 
-    @mock.patch('httpx.Client')
-    def test_make_request_500_server_error(self, MockClient, setup_client, caplog) -> None:
+    def test_make_request_500_server_error(self, setup_client, caplog) -> None:
         """Test handling of a generic server error (500)."""
         endpoint = 'action'
         mock_response_instance = mock_response(status_code=500, text='Internal Server Error')
-        MockClient.return_value.__enter__.return_value.request.return_value = mock_response_instance
 
-        with caplog.at_level(logging.ERROR):
+        with mock.patch.object(setup_client, '_client') as mock_http, caplog.at_level(logging.ERROR):
+            mock_http.stream.return_value = mock_stream(mock_response_instance)
             result = setup_client._make_authenticated_request(method='POST', endpoint=endpoint)
 
         assert result is None
         assert 'API Error (POST http://api.test/action): 500' in caplog.text
         assert 'Server Response Text: Internal Server Error' in caplog.text
 
+    def test_make_request_error_detail_from_json(self, setup_client, caplog) -> None:
+        """Test that the 'detail' of a JSON error response is logged."""
+        mock_response_instance = mock_response(status_code=422, json_data={'detail': 'Invalid command'})
+
+        with mock.patch.object(setup_client, '_client') as mock_http, caplog.at_level(logging.ERROR):
+            mock_http.stream.return_value = mock_stream(mock_response_instance)
+            result = setup_client._make_authenticated_request(method='POST', endpoint='command/execute')
+
+        assert result is None
+        assert 'API Error (POST http://api.test/command/execute): 422 - Invalid command' in caplog.text
+        assert 'Server Response Text' not in caplog.text
+
+    def test_make_request_retries_once_on_401(self, setup_client, caplog, clear_sessions) -> None:
+        """Test that a 401 triggers one re-login and replay, and a second 401 is not retried."""
+        with mock.patch.object(setup_client, '_client') as mock_http, caplog.at_level(logging.ERROR):
+            mock_http.stream.return_value = mock_stream(mock_response(status_code=401, text='Unauthorized'))
+            mock_http.post.return_value = mock_response(json_data={'access_token': self.NEW_TOKEN})
+            result = setup_client._make_authenticated_request(method='GET', endpoint='status')
+
+        assert result is None
+        assert mock_http.post.call_count == 1
+        assert mock_http.stream.call_count == 2
+        sent_tokens = [c.kwargs['headers']['X-Auth-Token'] for c in mock_http.stream.call_args_list]
+        assert sent_tokens == [self.TOKEN, self.NEW_TOKEN]
+        assert 'API Error (GET http://api.test/status): 401' in caplog.text
+        assert clear_sessions[(self.SERVER_URL, self.USERNAME)]['token'] == self.NEW_TOKEN
+
+    def test_make_request_streamed_content_rewound_on_retry(self, setup_client) -> None:
+        """Test that a streamed file body is sent in full again after a 401 re-login."""
+        playbook = io.BytesIO(b'commands:\n  - type: debug\n')
+        sent_bodies = []
+        responses = [mock_response(status_code=401, text='expired'), mock_response(json_data={'ok': True})]
+
+        def request_side_effect(method, url, **kwargs):
+            sent_bodies.append(b''.join(kwargs['content']))
+            return mock_stream(responses.pop(0))
+
+        with mock.patch.object(setup_client, '_client') as mock_http:
+            mock_http.stream.side_effect = request_side_effect
+            mock_http.post.return_value = mock_response(json_data={'access_token': self.NEW_TOKEN})
+            result = setup_client._make_authenticated_request(
+                method='POST', endpoint='playbooks/execute/yaml', content_data=playbook
+            )
+
+        assert result == {'ok': True}
+        assert sent_bodies == [b'commands:\n  - type: debug\n'] * 2
+
+    def test_make_request_non_seekable_stream(self, setup_client, caplog) -> None:
+        """Test that pipes can be uploaded, but are not replayed after a 401."""
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(write_fd, 'wb') as writer:
+            writer.write(b'commands: []\n')
+
+        with os.fdopen(read_fd, 'rb') as pipe, mock.patch.object(setup_client, '_client') as mock_http, \
+                caplog.at_level(logging.ERROR):
+            mock_http.stream.return_value = mock_stream(mock_response(status_code=401, text='expired'))
+            mock_http.post.return_value = mock_response(json_data={'access_token': self.NEW_TOKEN})
+            result = setup_client._make_authenticated_request(
+                method='POST', endpoint='playbooks/execute/yaml', content_data=pipe
+            )
+
+        assert result is None
+        assert mock_http.stream.call_count == 1
+        assert 'non-seekable request body was already consumed' in caplog.text
+
+    def test_make_request_sends_pipes_and_partially_read_files(self, setup_client, tmp_path) -> None:
+        """Test that pipes and files not at offset 0 go over the wire with a matching body length."""
+        sent_bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent_bodies.append(framed_body(request))
+            return httpx.Response(200, json={'ok': True})
+
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(write_fd, 'wb') as writer:
+            writer.write(b'commands: []\n')
+        playbook = tmp_path / 'playbook.yml'
+        playbook.write_bytes(b'# header\ncommands: []\n')
+
+        with httpx.Client(base_url=self.SERVER_URL, transport=httpx.MockTransport(handler)) as http, \
+                mock.patch.object(setup_client, '_client', http), \
+                os.fdopen(read_fd, 'rb') as pipe, open(playbook, 'rb') as f:
+            f.readline()
+            for stream in (pipe, f):
+                result = setup_client._make_authenticated_request(
+                    method='POST', endpoint='playbooks/execute/yaml', content_data=stream
+                )
+                assert result == {'ok': True}
+
+        assert sent_bodies == [b'commands: []\n'] * 2
+
 
 class TestClientExecutionMethods:
 
@@ -227,12 +623,13 @@ class TestClientExecutionMethods:
 
     @pytest.fixture
     def setup_client(self, clear_sessions):
-        clear_sessions[(self.SERVER_URL, self.USERNAME)] = self.TOKEN
+        clear_sessions[(self.SERVER_URL, self.USERNAME)] = {
+            'token': self.TOKEN, 'expires_at': None, 'headers': _auth_headers(self.TOKEN)}
         return RemoteAttackMateClient(
             self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD
         )
 
-    @mock.patch.object(RemoteAttackMateClient, '_make_authenticated_request')
+    @mock.patch.object(RemoteAttackMateClient, '_send_request')
     def test_execute_remote_playbook_yaml(self, mock_make_request, setup_client):
         """Test playbook execution with correct request parameters (YAML)."""
         yaml_content = 'commands: mock commands'
@@ -240,12 +637,23 @@ class TestClientExecutionMethods:
 
         mock_make_request.assert_called_once_with(
             method='POST',
-            endpoint='playbooks/execute/yaml',
+            path='playbooks/execute/yaml',
             content_data=yaml_content,
             params=None
         )
 
-    @mock.patch.object(RemoteAttackMateClient, '_make_authenticated_request')
+    @mock.patch.object(RemoteAttackMateClient, '_send_request')
+    def test_execute_remote_playbook_yaml_debug(self, mock_make_request, setup_client):
+        """Test that debug executions pass the debug query parameter."""
+        setup_client.execute_remote_playbook_yaml('commands: []', debug=True)
+        setup_client.execute_remote_playbook_yaml('commands: []', debug=True)
+
+        first, second = mock_make_request.call_args_list
+        assert first.kwargs['params'] == {'debug': 'true'}
+        # The same read-only params mapping is reused across calls
+        assert first.kwargs['params'] is second.kwargs['params']
+
+    @mock.patch.object(RemoteAttackMateClient, '_send_request')
     def test_execute_remote_command(self, mock_make_request, setup_client):
         """Test command execution with Pydantic model conversion."""
         mock_model = MockCommandModel({'type': 'shell', 'cmd': 'whoami'})
@@ -255,7 +663,100 @@ class TestClientExecutionMethods:
         expected_body = {'type': 'shell', 'cmd': 'whoami'}
         mock_make_request.assert_called_once_with(
             method='POST',
-            endpoint='command/execute',
+            path='command/execute',
             json_data=expected_body,
             params=None
         )
+
+    @mock.patch.object(RemoteAttackMateClient, '_send_request')
+    def test_execute_remote_command_with_dict(self, mock_make_request, setup_client):
+        """Test that a pre-dumped command dict is sent without conversion."""
+        command_body = {'type': 'shell', 'cmd': 'whoami'}
+
+        setup_client.execute_remote_command(command_body, debug=False)
+
+        assert mock_make_request.call_args.kwargs['json_data'] is command_body
+
+
+BUILD_ASYNC_CLIENT = 'attackmate_client.attackmate_client._build_async_client'
+
+
+class TestClientAsync:
+
+    SERVER_URL = 'http://api.test'
+    USERNAME = 'testuser'
+    PASSWORD = SecretStr('testpassword')
+    TOKEN = 'async_token'
+
+    def test_aexecute_remote_command(self, clear_sessions):
+        """Test async command execution through the async HTTP client."""
+        clear_sessions[(self.SERVER_URL, self.USERNAME)] = {
+            'token': self.TOKEN, 'expires_at': None, 'headers': _auth_headers(self.TOKEN)}
+        client = RemoteAttackMateClient(self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD)
+        expected_result = {'success': True}
+
+        with mock.patch(BUILD_ASYNC_CLIENT, return_value=mock.AsyncMock()) as build:
+            mock_http = build.return_value
+            mock_http.stream = mock.MagicMock(
+                return_value=mock_stream(mock_response(json_data=expected_result)))
+            result = asyncio.run(
+                client.aexecute_remote_command(MockCommandModel({'type': 'shell', 'cmd': 'whoami'}))
+            )
+
+        assert result == expected_result
+        call_kwargs = mock_http.stream.call_args.kwargs
+        assert call_kwargs['url'] == 'command/execute'
+        assert call_kwargs['json'] == {'type': 'shell', 'cmd': 'whoami'}
+        assert call_kwargs['headers'] == {'X-Auth-Token': self.TOKEN}
+
+    def test_concurrent_requests_share_one_login(self, clear_sessions):
+        """Test that concurrent async requests without a token trigger a single login."""
+        client = RemoteAttackMateClient(self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD)
+
+        async def slow_login(url, data, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response(json_data={'access_token': self.TOKEN})
+
+        async def run_batch():
+            commands = [MockCommandModel({'type': 'shell', 'cmd': str(i)}) for i in range(5)]
+            return await asyncio.gather(*(client.aexecute_remote_command(c) for c in commands))
+
+        with mock.patch(BUILD_ASYNC_CLIENT, return_value=mock.AsyncMock()) as build:
+            mock_http = build.return_value
+            mock_http.post.side_effect = slow_login
+            mock_http.stream = mock.MagicMock(
+                return_value=mock_stream(mock_response(json_data={'success': True})))
+            results = asyncio.run(run_batch())
+
+        assert results == [{'success': True}] * 5
+        mock_http.post.assert_called_once()
+        assert mock_http.stream.call_count == 5
+        assert clear_sessions[(self.SERVER_URL, self.USERNAME)]['token'] == self.TOKEN
+
+    def test_separate_event_loops_get_fresh_client_and_lock(self, clear_sessions):
+        """Test that one client can be used from consecutive asyncio.run() calls."""
+        client = RemoteAttackMateClient(self.SERVER_URL, username=self.USERNAME, password=self.PASSWORD)
+
+        async def slow_login(url, data, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response(json_data={'access_token': self.TOKEN})
+
+        def new_async_client(*args):
+            mock_http = mock.AsyncMock()
+            mock_http.post.side_effect = slow_login
+            mock_http.stream = mock.MagicMock(
+                return_value=mock_stream(mock_response(json_data={'success': True})))
+            return mock_http
+
+        async def run_batch():
+            commands = [MockCommandModel({'type': 'shell', 'cmd': str(i)}) for i in range(3)]
+            return await asyncio.gather(*(client.aexecute_remote_command(c) for c in commands))
+
+        with mock.patch(BUILD_ASYNC_CLIENT, side_effect=new_async_client) as build:
+            first = asyncio.run(run_batch())
+            # Force a contended login in the second loop, too
+            clear_sessions.clear()
+            second = asyncio.run(run_batch())
+
+        assert first == second == [{'success': True}] * 3
+        assert build.call_count == 2